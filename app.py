@@ -1,12 +1,18 @@
 import ssl
 import random
+import re
 import warnings
 import os
+from functools import lru_cache
 
 import nltk
 import spacy
+from spacy.matcher import DependencyMatcher
 from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize.treebank import TreebankWordDetokenizer
 from nltk.corpus import wordnet
+from nltk.corpus.reader.wordnet import ADJ, ADV, NOUN, VERB
+from nltk.tag import PerceptronTagger
 
 # Disable unnecessary warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -19,17 +25,89 @@ try:
     # Add sentencizer to handle sentence boundaries
     if "sentencizer" not in NLP_GLOBAL.pipe_names:
         NLP_GLOBAL.add_pipe("sentencizer")
+    # Components skipped when only sentence boundaries are needed. Passed
+    # per call rather than via select_pipes, which mutates the shared model.
+    _SENTENCE_ONLY_DISABLE = [p for p in NLP_GLOBAL.pipe_names if p != "sentencizer"]
     print("✅ spaCy model loaded successfully with sentencizer")
 except OSError:
     # Fallback for environments without spacy model
     NLP_GLOBAL = None
+    _SENTENCE_ONLY_DISABLE = []
     print("⚠️ spaCy model not available, using fallback mode")
 
+# Sentence boundary: terminal punctuation and whitespace before a capital,
+# quote or bracket, skipping common honorifics
+_SENT_SPLIT_RE = re.compile(
+    r'(?<=[.!?])(?<!\bMr\.)(?<!\bMrs\.)(?<!\bMs\.)(?<!\bDr\.)(?<!\bProf\.)(?<!\bSt\.)'
+    r'\s+(?=[A-Z"\'(])'
+)
+# Strict length limits for serverless
+MAX_INPUT_CHARS = 10000
+# Output limit, slightly above the input limit to account for expansions
+MAX_OUTPUT_CHARS = 15000
+
+# Regex-split segments longer than this are handed to Punkt instead
+MAX_REGEX_SENTENCE_CHARS = 500
+
+# Penn Treebank tags starting with J, N, V or R (content words)
+_CONTENT_TAGS = frozenset({
+    'JJ', 'JJR', 'JJS',
+    'NN', 'NNS', 'NNP', 'NNPS',
+    'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ',
+    'RB', 'RBR', 'RBS', 'RP'
+})
+
+# NLTK data bundled with the deployment by prebuild.py
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+
+# Minimal required resources and their nltk.data paths
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'wordnet': 'corpora/wordnet',
+}
+
+# Written to NLTK_DATA_DIR once every resource above has been found in it;
+# lists the resource names so adding one invalidates it
+NLTK_READY_MARKER = os.path.join(NLTK_DATA_DIR, '.nltk_ready')
+_NLTK_READY_CONTENT = ','.join(sorted(NLTK_RESOURCES))
+
+# First letter of a Penn tag -> WordNet POS (reader constants, so the lazy
+# wordnet corpus isn't loaded at import)
+_PTB_TO_WORDNET = {'J': ADJ, 'N': NOUN, 'R': ADV, 'V': VERB}
+
+# Root verb with a nominal subject and a direct object among its children.
+# Matches come back as token indices in this order: verb, subject, object.
+_PASSIVE_PATTERN = [
+    {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"DEP": "ROOT"}},
+    {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject", "RIGHT_ATTRS": {"DEP": "nsubj"}},
+    {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "object", "RIGHT_ATTRS": {"DEP": "dobj"}},
+]
+
+# Undoes word_tokenize splits ("John 's" -> "John's") when rebuilding sentences
+_DETOKENIZER = TreebankWordDetokenizer()
+
+# Shared perceptron tagger, loaded once by _get_tagger()
+_TAGGER = None
+
+# Set once download_nltk_resources() has run in this process
+_NLTK_INITIALIZED = False
+
 def download_nltk_resources():
     """
     Download required NLTK resources if not already installed.
-    Optimized for serverless environments.
+    Optimized for serverless environments: data bundled by prebuild.py
+    is used as-is, so a prepared deployment makes no network calls.
+    Calls after the first in a process return immediately.
     """
+    global _NLTK_INITIALIZED
+    if _NLTK_INITIALIZED:
+        return
+    _NLTK_INITIALIZED = True
+
+    if os.path.isdir(NLTK_DATA_DIR) and NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+
     try:
         _create_unverified_https_context = ssl._create_unverified_context
     except AttributeError:
@@ -37,13 +115,125 @@ def download_nltk_resources():
     else:
         ssl._create_default_https_context = _create_unverified_https_context
 
-    # Minimal required resources
-    resources = ['punkt', 'averaged_perceptron_tagger', 'wordnet']
-    for resource in resources:
-        try:
-            nltk.download(resource, quiet=True)
-        except Exception as e:
-            print(f"⚠️ Error downloading {resource}: {str(e)}")
+    if not _nltk_marker_is_current():
+        for resource, path in NLTK_RESOURCES.items():
+            try:
+                # nltk.download fetches the remote index even when up to date
+                nltk.data.find(path)
+                continue
+            except LookupError:
+                pass
+
+            try:
+                nltk.download(resource, quiet=True)
+            except Exception as e:
+                print(f"⚠️ Error downloading {resource}: {str(e)}")
+
+        # Later cold starts skip the probing above, so resources found or
+        # downloaded outside NLTK_DATA_DIR must not count towards the marker
+        if _nltk_resources_in_data_dir():
+            try:
+                with open(NLTK_READY_MARKER, 'w') as f:
+                    f.write(_NLTK_READY_CONTENT)
+            except OSError:
+                pass
+
+    # Load the tagger now so the first request doesn't pay for it
+    try:
+        _get_tagger()
+    except Exception as e:
+        print(f"⚠️ Error loading POS tagger: {str(e)}")
+
+    # Same for WordNet: resolve the lazy corpus and touch its index files
+    try:
+        wordnet.ensure_loaded()
+        wordnet.synsets('run')
+    except Exception as e:
+        print(f"⚠️ Error loading WordNet: {str(e)}")
+
+def _nltk_marker_is_current():
+    """
+    True if an earlier start already found every resource in NLTK_RESOURCES
+    in NLTK_DATA_DIR.
+    """
+    try:
+        with open(NLTK_READY_MARKER) as f:
+            return f.read() == _NLTK_READY_CONTENT
+    except OSError:
+        return False
+
+def _nltk_resources_in_data_dir():
+    """
+    True if every resource in NLTK_RESOURCES is installed in NLTK_DATA_DIR.
+    """
+    if not os.path.isdir(NLTK_DATA_DIR):
+        return False
+    try:
+        for path in NLTK_RESOURCES.values():
+            nltk.data.find(path, paths=[NLTK_DATA_DIR])
+    except LookupError:
+        return False
+    return True
+
+def _get_tagger():
+    """
+    Return the shared perceptron tagger, loading it on first use.
+    """
+    global _TAGGER
+    if _TAGGER is None:
+        _TAGGER = PerceptronTagger()
+    return _TAGGER
+
+def pos_tag_fast(tokens):
+    """
+    POS-tag tokens with the shared tagger.
+    nltk.pos_tag unpickles a new PerceptronTagger on every call.
+    """
+    return _get_tagger().tag(tokens)
+
+@lru_cache(maxsize=8192)
+def _get_synonyms_cached(word, wn_pos):
+    """
+    Memoized WordNet lookup for a lowercased word and WordNet POS.
+    Returns a tuple so cached results can't be mutated by callers.
+    """
+    synonyms = set()
+    for syn in wordnet.synsets(word, pos=wn_pos):
+        for lemma in syn.lemmas():
+            lemma_name = lemma.name().replace('_', ' ')
+            if (lemma_name.lower() != word and
+                len(lemma_name.split()) == 1 and
+                lemma_name.isalpha()):
+                synonyms.add(lemma_name)
+                # Strict memory limit
+                if len(synonyms) >= 5:
+                    break
+        if len(synonyms) >= 5:
+            break
+    return tuple(synonyms)
+
+@lru_cache(maxsize=4096)
+def _get_simple_synonyms_cached(word):
+    """
+    Memoized POS-agnostic WordNet lookup for a lowercased word: at most
+    three single-word synonyms longer than three letters.
+    """
+    synonyms = set()
+    for syn in wordnet.synsets(word):
+        for lemma in syn.lemmas():
+            lemma_name = lemma.name().replace('_', ' ')
+            if (lemma_name.lower() != word and 
+                len(lemma_name.split()) == 1 and  # Single word only
+                lemma_name.isalpha() and
+                len(lemma_name) > 3):  # Avoid very short synonyms
+                synonyms.add(lemma_name)
+                
+                # Limit to 3 synonyms to save memory
+                if len(synonyms) >= 3:
+                    break
+        if len(synonyms) >= 3:
+            break
+    return tuple(synonyms)
 
 class AcademicTextHumanizer:
     """
@@ -58,19 +248,20 @@ class AcademicTextHumanizer:
         p_academic_transition=0.3,
         seed=None
     ):
-        if seed is not None:
-            random.seed(seed)
+        # Instance RNG, so seeding one humanizer never reseeds the global
+        # random module other code relies on
+        self._rng = random.Random(seed)
 
-        # Load spaCy with sentencizer for sentence boundary detection
-        try:
-            self.nlp = spacy.load("en_core_web_sm", disable=["ner", "textcat"])
-            # Add sentencizer to handle sentence boundaries
-            if "sentencizer" not in self.nlp.pipe_names:
-                self.nlp.add_pipe("sentencizer")
-            print("✅ AcademicTextHumanizer: spaCy loaded with sentencizer")
-        except OSError:
-            self.nlp = None
+        # Share the module-level spaCy pipeline instead of loading another copy
+        self.nlp = NLP_GLOBAL
+        if self.nlp is None:
             print("⚠️ AcademicTextHumanizer: spaCy not available - using basic text processing")
+            self._passive_matcher = None
+        else:
+            # Finds subject-verb-object triples in compiled code instead of
+            # scanning every token's dependency label in Python
+            self._passive_matcher = DependencyMatcher(self.nlp.vocab)
+            self._passive_matcher.add("ACTIVE_SVO", [_PASSIVE_PATTERN])
 
         # Conservative probabilities for serverless
         self.p_passive = min(p_passive, 0.3)  # Cap at 30%
@@ -83,6 +274,37 @@ class AcademicTextHumanizer:
             "Therefore,", "Consequently,", "Nonetheless,", "Nevertheless,"
         ]
 
+        # Common words that benefit from academic synonyms
+        self.academic_word_map = {
+            'big': ['substantial', 'considerable', 'significant'],
+            'small': ['minimal', 'modest', 'limited'],
+            'good': ['effective', 'beneficial', 'advantageous'],
+            'bad': ['ineffective', 'detrimental', 'problematic'],
+            'important': ['crucial', 'essential', 'paramount'],
+            'show': ['demonstrate', 'illustrate', 'reveal'],
+            'get': ['obtain', 'acquire', 'secure'],
+            'use': ['utilize', 'employ', 'implement'],
+            'make': ['create', 'produce', 'generate'],
+            'help': ['assist', 'facilitate', 'enable'],
+            'start': ['initiate', 'commence', 'undertake'],
+            'end': ['conclude', 'terminate', 'complete'],
+            'change': ['modify', 'alter', 'transform'],
+            'look': ['examine', 'analyze', 'investigate'],
+            'think': ['consider', 'contemplate', 'deliberate'],
+            'know': ['understand', 'comprehend', 'recognize'],
+            'see': ['observe', 'perceive', 'witness'],
+            'give': ['provide', 'offer', 'supply'],
+            'take': ['accept', 'receive', 'acquire'],
+            'put': ['place', 'position', 'locate'],
+            'keep': ['maintain', 'preserve', 'retain'],
+            'let': ['allow', 'permit', 'enable'],
+            'feel': ['experience', 'perceive', 'sense'],
+            'try': ['attempt', 'endeavor', 'strive'],
+            'work': ['function', 'operate', 'perform'],
+            'need': ['require', 'necessitate', 'demand'],
+            'want': ['desire', 'require', 'seek']
+        }
+
         # Common contractions mapping
         self.contractions_map = {
             "n't": " not", "'re": " are", "'s": " is", "'ll": " will",
@@ -93,23 +315,66 @@ class AcademicTextHumanizer:
             "hasn't": "has not", "hadn't": "had not", "wouldn't": "would not",
             "shouldn't": "should not", "couldn't": "could not", "mightn't": "might not"
         }
-
-    def humanize_text(self, text, use_passive=False, use_synonyms=False):
+        # Single alternation, longest first so "won't" wins over "n't"
+        self._contraction_re = re.compile("|".join(
+            re.escape(contraction)
+            for contraction in sorted(self.contractions_map, key=len, reverse=True)
+        ))
+        # Seeded output is deterministic, so repeated seeded calls reuse it
+        self._humanize_seeded = lru_cache(maxsize=128)(self._humanize_seeded_uncached)
+        # Parsed sentences, so repeated sentences skip the spaCy pipeline
+        self._parse_cached = lru_cache(maxsize=256)(self._parse_uncached)
+
+    def humanize_text(self, text, use_passive=False, use_synonyms=False, seed=None):
         """
         Humanize text with memory safety limits and strict input validation.
+
+        A per-call seed draws from a private RNG, so the shared HUMANIZER
+        can give reproducible output without reseeding global state. Seeded
+        results are cached; unseeded calls are meant to vary and always run.
         """
         # Input validation
         if not text or not isinstance(text, str):
             return "Error: Invalid input text"
             
+        # Reject huge input before strip() copies it. Text this long is
+        # refused even if stripping its surrounding whitespace would bring
+        # it under MAX_INPUT_CHARS; that case is traded for not copying it.
+        if len(text) > MAX_INPUT_CHARS * 2:
+            return "Error: Input text too long for processing (max 10,000 characters)"
+            
         text = text.strip()
         if not text:
             return "Please enter some text to process."
 
         # Strict length limits for serverless
-        if len(text) > 10000:  # 10K character limit
+        if len(text) > MAX_INPUT_CHARS:
             return "Error: Input text too long for processing (max 10,000 characters)"
-        
+
+        if seed is None:
+            return self._humanize_text(text, use_passive, use_synonyms, seed)
+
+        # Seed types random.Random accepts that can also key the cache
+        if not isinstance(seed, (int, float, str, bytes)):
+            return "Error: Invalid seed (must be an integer, float, string or bytes)"
+
+        # Only validated, stripped text reaches the cache
+        return self._humanize_seeded(
+            text, bool(use_passive), bool(use_synonyms), seed,
+            (self.p_passive, self.p_synonym_replacement, self.p_academic_transition)
+        )
+
+    def _humanize_seeded_uncached(self, text, use_passive, use_synonyms, seed, probabilities):
+        # probabilities are only part of the cache key: changing them on the
+        # instance must not return results computed with the old values
+        return self._humanize_text(text, use_passive, use_synonyms, seed)
+
+    def _humanize_text(self, text, use_passive, use_synonyms, seed):
+        """
+        Uncached humanize_text for validated, stripped text.
+        """
+        rng = random.Random(seed) if seed is not None else self._rng
+
         try:
             # Get sentences using the appropriate method
             sentences = self._get_sentences(text)
@@ -117,35 +382,46 @@ class AcademicTextHumanizer:
             if not sentences:
                 return "No valid sentences found to process."
 
-            transformed_sentences = []
+            # Only contraction expansion can apply, so expand the whole
+            # document in one regex pass instead of looping per sentence
+            if ((not use_passive or self.p_passive <= 0) and
+                    (not use_synonyms or self.p_synonym_replacement <= 0) and
+                    self.p_academic_transition <= 0):
+                result = self.expand_contractions(' '.join(sentences))
+            else:
+                transformed_sentences = []
+                # Joined length so far, so oversized output is rejected as
+                # soon as it crosses the limit instead of after the last sentence
+                output_chars = -1
             
-            for sentence in sentences:
-                if not sentence:
-                    continue
-                    
-                current_sentence = sentence
+                # _get_sentences only returns stripped, non-empty sentences
+                for sentence in sentences:
+                    current_sentence = sentence
 
-                # 1. Expand contractions
-                current_sentence = self.expand_contractions(current_sentence)
+                    # 1. Expand contractions
+                    current_sentence = self.expand_contractions(current_sentence)
 
-                # 2. Possibly add academic transitions (with lower probability)
-                if random.random() < self.p_academic_transition:
-                    current_sentence = self.add_academic_transitions(current_sentence)
+                    # 2. Possibly add academic transitions (with lower probability)
+                    if rng.random() < self.p_academic_transition:
+                        current_sentence = self.add_academic_transitions(current_sentence, rng)
 
-                # 3. Optionally convert to passive (simplified)
-                if use_passive and random.random() < self.p_passive:
-                    current_sentence = self.convert_to_passive_simple(current_sentence)
+                    # 3. Optionally convert to passive (simplified)
+                    if use_passive and rng.random() < self.p_passive:
+                        current_sentence = self.convert_to_passive_simple(current_sentence)
 
-                # 4. Optionally replace words with synonyms (simplified)
-                if use_synonyms and random.random() < self.p_synonym_replacement:
-                    current_sentence = self.replace_with_synonyms_simple(current_sentence)
+                    # 4. Optionally replace words with synonyms (simplified)
+                    if use_synonyms and rng.random() < self.p_synonym_replacement:
+                        current_sentence = self.replace_with_synonyms_simple(current_sentence, rng)
 
-                transformed_sentences.append(current_sentence)
+                    transformed_sentences.append(current_sentence)
+                    output_chars += len(current_sentence) + 1
+                    if output_chars > MAX_OUTPUT_CHARS:
+                        return "Error: Output too large after processing"
 
-            result = ' '.join(transformed_sentences)
+                result = ' '.join(transformed_sentences)
             
             # Final safety check
-            if len(result) > 15000:  # Slightly larger to account for expansions
+            if len(result) > MAX_OUTPUT_CHARS:
                 return "Error: Output too large after processing"
                 
             return result
@@ -157,7 +433,12 @@ class AcademicTextHumanizer:
         """
         Extract sentences using the best available method.
         """
-        # Use NLTK sent_tokenize as primary method (most reliable)
+        # Precompiled regex split handles ordinary prose without running Punkt
+        sentences = [s.strip() for s in _SENT_SPLIT_RE.split(text) if s.strip()]
+        if sentences and max(len(s) for s in sentences) <= MAX_REGEX_SENTENCE_CHARS:
+            return sentences
+
+        # Use NLTK sent_tokenize when the regex leaves very long segments
         try:
             sentences = [s.strip() for s in sent_tokenize(text) if s.strip()]
             if sentences:
@@ -165,10 +446,11 @@ class AcademicTextHumanizer:
         except Exception as e:
             print(f"⚠️ NLTK sent_tokenize failed: {e}")
         
-        # Fallback to spaCy with sentencizer if available
+        # Fallback to spaCy's rule-based sentencizer if available; the
+        # tagger and parser add nothing to sentence splitting here
         if self.nlp is not None:
             try:
-                doc = self.nlp(text)
+                doc = self.nlp(text, disable=_SENTENCE_ONLY_DISABLE)
                 sentences = [sent.text.strip() for sent in doc.sents if sent.text.strip()]
                 if sentences:
                     return sentences
@@ -186,111 +468,81 @@ class AcademicTextHumanizer:
         if not sentence:
             return sentence
             
-        result = sentence
-        # Sort by length descending to handle longer contractions first
-        contractions_sorted = sorted(self.contractions_map.items(), 
-                                   key=lambda x: len(x[0]), 
-                                   reverse=True)
-        
-        for contraction, expansion in contractions_sorted:
-            result = result.replace(contraction, expansion)
-            
-        return result
+        # One scan over the sentence instead of one str.replace per contraction
+        return self._contraction_re.sub(
+            lambda m: self.contractions_map[m.group(0)], sentence
+        )
 
-    def add_academic_transitions(self, sentence):
+    def add_academic_transitions(self, sentence, rng=None):
         """
         Add academic transition words at the beginning of sentences.
         """
         if not sentence:
             return sentence
+        if rng is None:
+            rng = self._rng
             
-        transition = random.choice(self.academic_transitions)
+        transition = rng.choice(self.academic_transitions)
         return f"{transition} {sentence}"
 
     def convert_to_passive_simple(self, sentence):
         """
         Simplified passive voice conversion using basic pattern matching.
         """
-        if not sentence or len(sentence.split()) < 3:
+        if not sentence:
             return sentence
 
+        # Split once and reuse it for the length gate
         words = sentence.split()
+        if len(words) < 3:
+            return sentence
         
         # Very basic pattern matching for common active structures
-        if len(words) >= 3:
-            # Check for simple subject-verb-object pattern
-            if (words[0][0].isupper() and  # Subject likely capitalized
-                words[1].lower() in ['is', 'are', 'was', 'were']):
-                return sentence  # Already passive-like
-            
-            # Simple transformation for common patterns
-            if len(words) == 3:
-                # "Subject Verb Object" -> "Object is Verb by Subject"
-                return f"{words[2]} is {words[1]} by {words[0].lower()}"
-            elif len(words) == 4:
-                # Handle simple cases with articles
-                if words[1] in ['a', 'an', 'the']:
-                    return f"{words[2]} {words[3]} is {words[1]} by {words[0].lower()}"
+        # Check for simple subject-verb-object pattern
+        if (words[0][0].isupper() and  # Subject likely capitalized
+            words[1].lower() in ['is', 'are', 'was', 'were']):
+            return sentence  # Already passive-like
+        
+        # Simple transformation for common patterns
+        if len(words) == 3:
+            # "Subject Verb Object" -> "Object is Verb by Subject"
+            return f"{words[2]} is {words[1]} by {words[0].lower()}"
+        elif len(words) == 4:
+            # Handle simple cases with articles
+            if words[1] in ['a', 'an', 'the']:
+                return f"{words[2]} {words[3]} is {words[1]} by {words[0].lower()}"
         
         return sentence
 
-    def replace_with_synonyms_simple(self, sentence):
+    def replace_with_synonyms_simple(self, sentence, rng=None):
         """
         Simplified synonym replacement without heavy models.
         Focuses on common academic words.
         """
         if not sentence:
             return sentence
+        if rng is None:
+            rng = self._rng
             
         words = sentence.split()
         new_words = []
         
-        # Common words that benefit from academic synonyms
-        academic_word_map = {
-            'big': ['substantial', 'considerable', 'significant'],
-            'small': ['minimal', 'modest', 'limited'],
-            'good': ['effective', 'beneficial', 'advantageous'],
-            'bad': ['ineffective', 'detrimental', 'problematic'],
-            'important': ['crucial', 'essential', 'paramount'],
-            'show': ['demonstrate', 'illustrate', 'reveal'],
-            'get': ['obtain', 'acquire', 'secure'],
-            'use': ['utilize', 'employ', 'implement'],
-            'make': ['create', 'produce', 'generate'],
-            'help': ['assist', 'facilitate', 'enable'],
-            'start': ['initiate', 'commence', 'undertake'],
-            'end': ['conclude', 'terminate', 'complete'],
-            'change': ['modify', 'alter', 'transform'],
-            'look': ['examine', 'analyze', 'investigate'],
-            'think': ['consider', 'contemplate', 'deliberate'],
-            'know': ['understand', 'comprehend', 'recognize'],
-            'see': ['observe', 'perceive', 'witness'],
-            'give': ['provide', 'offer', 'supply'],
-            'take': ['accept', 'receive', 'acquire'],
-            'put': ['place', 'position', 'locate'],
-            'keep': ['maintain', 'preserve', 'retain'],
-            'let': ['allow', 'permit', 'enable'],
-            'feel': ['experience', 'perceive', 'sense'],
-            'try': ['attempt', 'endeavor', 'strive'],
-            'work': ['function', 'operate', 'perform'],
-            'need': ['require', 'necessitate', 'demand'],
-            'want': ['desire', 'require', 'seek']
-        }
-        
         for word in words:
             # Only process words that are likely to have good synonyms
             clean_word = word.lower().strip('.,!?;:')
             
-            if (len(clean_word) > 3 and 
-                clean_word.isalpha() and 
-                random.random() < 0.4 and  # 40% chance per eligible word
-                clean_word in academic_word_map):
+            # Check the map first so the RNG is only drawn for words
+            # that can actually be replaced
+            if (clean_word in self.academic_word_map and
+                len(clean_word) > 3 and
+                rng.random() < 0.4):  # 40% chance per eligible word
                 
-                synonyms = academic_word_map[clean_word]
-                chosen_synonym = random.choice(synonyms)
+                synonyms = self.academic_word_map[clean_word]
+                chosen_synonym = rng.choice(synonyms)
                 
-                # Preserve capitalization
+                # Preserve capitalization (capitalize() would also lowercase the tail)
                 if word[0].isupper():
-                    chosen_synonym = chosen_synonym.capitalize()
+                    chosen_synonym = chosen_synonym[:1].upper() + chosen_synonym[1:]
                     
                 new_words.append(chosen_synonym)
             else:
@@ -302,29 +554,15 @@ class AcademicTextHumanizer:
         """
         Get synonyms using WordNet with memory limits.
         Fallback method if the static map doesn't have the word.
+        Returns a cached tuple, or None when there are no synonyms.
         """
         if not word or len(word) <= 3:
             return None
             
         try:
-            synonyms = set()
-            for syn in wordnet.synsets(word):
-                for lemma in syn.lemmas():
-                    lemma_name = lemma.name().replace('_', ' ')
-                    if (lemma_name.lower() != word.lower() and 
-                        len(lemma_name.split()) == 1 and  # Single word only
-                        lemma_name.isalpha() and
-                        len(lemma_name) > 3):  # Avoid very short synonyms
-                        synonyms.add(lemma_name)
-                        
-                        # Limit to 3 synonyms to save memory
-                        if len(synonyms) >= 3:
-                            break
-                if len(synonyms) >= 3:
-                    break
-                    
-            return list(synonyms) if synonyms else None
-            
+            # wordnet.synsets lowercases its argument, so the lowercased word
+            # is the cache key
+            return _get_simple_synonyms_cached(word.lower()) or None
         except Exception:
             return None
 
@@ -337,24 +575,28 @@ class AcademicTextHumanizer:
             return self.convert_to_passive_simple(sentence)
             
         try:
-            doc = self.nlp(sentence)
-            subj_tokens = [t for t in doc if t.dep_ == 'nsubj' and t.head.dep_ == 'ROOT']
-            dobj_tokens = [t for t in doc if t.dep_ == 'dobj']
-
-            if subj_tokens and dobj_tokens:
-                subject = subj_tokens[0]
-                dobj = dobj_tokens[0]
-                verb = subject.head
-                if subject.i < verb.i < dobj.i:
+            doc = self._parse_cached(sentence)
+
+            for _, (verb_i, subj_i, dobj_i) in self._passive_matcher(doc):
+                if subj_i + 1 == verb_i and verb_i + 1 == dobj_i:
+                    subject, verb, dobj = doc[subj_i], doc[verb_i], doc[dobj_i]
+                    # Splice the adjacent subject-verb-object by index and keep
+                    # the original spacing of the untouched tokens
                     passive_str = f"{dobj.text} {verb.lemma_} by {subject.text}"
-                    original_str = ' '.join(token.text for token in doc)
-                    chunk = f"{subject.text} {verb.text} {dobj.text}"
-                    if chunk in original_str:
-                        return original_str.replace(chunk, passive_str)
+                    pieces = [token.text_with_ws for token in doc]
+                    pieces[subject.i:dobj.i + 1] = [passive_str + dobj.whitespace_]
+                    return ''.join(pieces)
             return sentence
         except Exception:
             return self.convert_to_passive_simple(sentence)
 
+    def _parse_uncached(self, sentence):
+        """
+        Full spaCy parse of one sentence. The Doc is shared through
+        _parse_cached, so callers must only read it.
+        """
+        return self.nlp(sentence)
+
     def replace_with_synonyms(self, sentence):
         """
         Original synonym replacement (fallback) with WordNet.
@@ -364,19 +606,23 @@ class AcademicTextHumanizer:
             
         try:
             tokens = word_tokenize(sentence)
-            pos_tags = nltk.pos_tag(tokens)
+            # No token can be replaced, so skip the tagger entirely
+            if not any(len(t) > 3 and t.isalpha() for t in tokens):
+                return sentence
+            pos_tags = pos_tag_fast(tokens)
 
             new_tokens = []
             for (word, pos) in pos_tags:
-                if (pos.startswith(('J', 'N', 'V', 'R')) and 
+                if (pos in _CONTENT_TAGS and 
                     len(word) > 3 and 
-                    word.isalpha() and
-                    wordnet.synsets(word)):
-                    if random.random() < 0.3:  # Lower probability for memory safety
+                    word.isalpha()):
+                    # No separate synsets() probe: _get_synonyms is memoized and
+                    # comes back empty for words WordNet doesn't know
+                    if self._rng.random() < 0.3:  # Lower probability for memory safety
                         synonyms = self._get_synonyms(word, pos)
                         if synonyms:
                             # Use random selection instead of model-based for memory
-                            best_synonym = random.choice(synonyms)
+                            best_synonym = self._rng.choice(synonyms)
                             new_tokens.append(best_synonym if best_synonym else word)
                         else:
                             new_tokens.append(word)
@@ -385,7 +631,7 @@ class AcademicTextHumanizer:
                 else:
                     new_tokens.append(word)
 
-            return ' '.join(new_tokens)
+            return _DETOKENIZER.detokenize(new_tokens)
         except Exception:
             return self.replace_with_synonyms_simple(sentence)
 
@@ -396,33 +642,40 @@ class AcademicTextHumanizer:
         if len(word) <= 3:
             return None
             
-        wn_pos = None
-        if pos.startswith('J'):
-            wn_pos = wordnet.ADJ
-        elif pos.startswith('N'):
-            wn_pos = wordnet.NOUN
-        elif pos.startswith('R'):
-            wn_pos = wordnet.ADV
-        elif pos.startswith('V'):
-            wn_pos = wordnet.VERB
-
-        synonyms = set()
+        # None (any POS) for tags outside J/N/R/V, as before
+        wn_pos = _PTB_TO_WORDNET.get(pos[:1])
+
         try:
-            for syn in wordnet.synsets(word, pos=wn_pos):
-                for lemma in syn.lemmas():
-                    lemma_name = lemma.name().replace('_', ' ')
-                    if (lemma_name.lower() != word.lower() and
-                        len(lemma_name.split()) == 1 and
-                        lemma_name.isalpha()):
-                        synonyms.add(lemma_name)
-                        # Strict memory limit
-                        if len(synonyms) >= 5:
-                            break
-                if len(synonyms) >= 5:
-                    break
-            return list(synonyms)
+            # Repeated words in a document hit the cache instead of WordNet
+            return _get_synonyms_cached(word.lower(), wn_pos)
         except Exception:
             return None
 
+def warm_up():
+    """
+    Run the lazily initialized stages once at startup (Punkt inside
+    word_tokenize, spaCy's first call, the humanizer itself) so the
+    first real request is as fast as later ones.
+    """
+    try:
+        word_tokenize("Warm up the tokenizer.")
+        if NLP_GLOBAL is not None:
+            NLP_GLOBAL("Warm up the pipeline.")
+        HUMANIZER.humanize_text(
+            "We don't keep this text. It only warms up the pipeline.",
+            use_passive=True,
+            use_synonyms=True
+        )
+    except Exception as e:
+        print(f"⚠️ Warm-up failed: {str(e)}")
+
 # Initialize NLTK resources when module is imported
 download_nltk_resources()
+
+# Shared humanizer: reuse it across requests instead of constructing one per call
+HUMANIZER = AcademicTextHumanizer(
+    p_passive=0.2,
+    p_synonym_replacement=0.2,
+    p_academic_transition=0.3
+)
+warm_up()
@@ -0,0 +1,26 @@
+"""
+Download the NLTK data used by app.py into ./nltk_data at build time.
+
+Run this before packaging the deployment so cold starts load the bundled
+data instead of calling nltk.download():
+
+    python prebuild.py
+"""
+import os
+
+import nltk
+
+# Same location and resources as NLTK_DATA_DIR / NLTK_RESOURCES in app.py
+# (not imported: importing app.py downloads data and loads spaCy)
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+RESOURCES = ['punkt', 'averaged_perceptron_tagger', 'wordnet']
+
+
+def main():
+    for resource in RESOURCES:
+        nltk.download(resource, download_dir=NLTK_DATA_DIR, quiet=True)
+        print(f"✅ {resource} -> {NLTK_DATA_DIR}")
+
+
+if __name__ == "__main__":
+    main()
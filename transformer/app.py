@@ -1,7 +1,28 @@
+import gzip
+import hashlib
 import json
+import os
 import random
 import re
-from http.server import BaseHTTPRequestHandler
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    # Optional: several times faster than json.dumps and emits UTF-8 directly
+    import orjson
+except ImportError:
+    orjson = None
+
+# Request bodies above this are refused before they are read
+MAX_BODY_BYTES = 1024 * 1024
+
+# JSON bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+
+# Whitespace after terminal punctuation
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
 
 
 class MicroAcademicHumanizer:
@@ -14,8 +35,9 @@ class MicroAcademicHumanizer:
         p_rhythm=0.5,
         seed=None
     ):
-        if seed is not None:
-            random.seed(seed)
+        # Instance RNG, so seeding one humanizer never reseeds the global
+        # random module other code relies on
+        self._rng = random.Random(seed)
         self.p_synonym = p_synonym
         self.p_transition = p_transition
         self.p_rhythm = p_rhythm
@@ -45,15 +67,63 @@ class MicroAcademicHumanizer:
             "new": ["novel", "innovative", "recent"],
             "big": ["significant", "substantial", "considerable"],
         }
+        
+        # Contraction suffixes, expanded in one pass by a single alternation
+        self.contractions_map = {
+            "n't": " not", "'re": " are", "'s": " is", "'ll": " will",
+            "'ve": " have", "'d": " would", "'m": " am"
+        }
+        self._contraction_re = re.compile("|".join(
+            re.escape(contraction)
+            for contraction in sorted(self.contractions_map, key=len, reverse=True)
+        ))
     
-    def humanize_text(self, text):
-        """Main method to humanize text."""
+    def humanize_text(
+        self,
+        text,
+        p_synonym=None,
+        p_transition=None,
+        p_rhythm=None,
+        seed=None
+    ):
+        """
+        Main method to humanize text.
+
+        Probabilities default to the instance settings. Passing them (and a
+        seed) per call keeps the instance free of per-request state, so one
+        shared humanizer can serve every request.
+        """
         if not text or not isinstance(text, str):
             return "Invalid input"
         
+        return " ".join(self.iter_humanized(
+            text, p_synonym, p_transition, p_rhythm, seed
+        ))
+    
+    def iter_humanized(
+        self,
+        text,
+        p_synonym=None,
+        p_transition=None,
+        p_rhythm=None,
+        seed=None
+    ):
+        """
+        Yield the humanized sentences of `text` one at a time.
+
+        humanize_text joins these with spaces; the API streams them so the
+        first sentence goes out before the rest are processed.
+        """
+        if p_synonym is None:
+            p_synonym = self.p_synonym
+        if p_transition is None:
+            p_transition = self.p_transition
+        if p_rhythm is None:
+            p_rhythm = self.p_rhythm
+        rng = random.Random(seed) if seed is not None else self._rng
+        
         # Simple sentence split
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-        transformed = []
+        sentences = _SENT_SPLIT_RE.split(text.strip())
         
         for sent in sentences:
             if not sent:
@@ -61,71 +131,236 @@ class MicroAcademicHumanizer:
             
             s = self._expand_contractions(sent)
             
-            if random.random() < self.p_transition:
-                s = f"{random.choice(self.transitions)} {s}"
+            if rng.random() < p_transition:
+                s = f"{rng.choice(self.transitions)} {s}"
             
-            if random.random() < self.p_synonym:
-                s = self._replace_synonyms(s)
+            if rng.random() < p_synonym:
+                s = self._replace_synonyms(s, rng)
             
-            if random.random() < self.p_rhythm:
-                s = self._vary_rhythm(s)
+            if rng.random() < p_rhythm:
+                s = self._vary_rhythm(s, rng)
             
-            transformed.append(s)
-        
-        return " ".join(transformed)
+            yield s
     
     def _expand_contractions(self, sentence):
         """Expand common contractions."""
-        mapping = {
-            "n't": " not", "'re": " are", "'s": " is", "'ll": " will",
-            "'ve": " have", "'d": " would", "'m": " am"
-        }
-        for k, v in mapping.items():
-            sentence = sentence.replace(k, v)
-        return sentence
+        return self._contraction_re.sub(
+            lambda m: self.contractions_map[m.group(0)], sentence
+        )
     
-    def _replace_synonyms(self, sentence):
+    def _replace_synonyms(self, sentence, rng=None):
         """Replace words with academic synonyms."""
+        if rng is None:
+            rng = self._rng
         words = sentence.split()
         new_words = []
         
         for w in words:
             key = w.lower().strip(".,!?")
-            if key in self.synonyms and random.random() < 0.6:
-                choice = random.choice(self.synonyms[key])
+            if key in self.synonyms and rng.random() < 0.6:
+                choice = rng.choice(self.synonyms[key])
                 if w[0].isupper():
-                    choice = choice.capitalize()
+                    choice = choice[:1].upper() + choice[1:]
                 new_words.append(choice)
             else:
                 new_words.append(w)
         
         return " ".join(new_words)
     
-    def _vary_rhythm(self, sentence):
+    def _vary_rhythm(self, sentence, rng=None):
         """Vary sentence rhythm for naturalness."""
-        func = random.choice(self.rhythm_patterns)
+        if rng is None:
+            rng = self._rng
+        func = rng.choice(self.rhythm_patterns)
+        # rhythm_patterns is public and may hold caller-supplied patterns; a
+        # failing one must not break a response that is already streaming
         try:
             return func(sentence)
         except Exception:
             return sentence
 
 
+# Shared across requests; per-request settings are passed to humanize_text
+HUMANIZER = MicroAcademicHumanizer()
+
+def _accepts_gzip(accept_encoding):
+    """
+    Whether an Accept-Encoding header value allows gzip.
+
+    An explicit gzip entry decides; otherwise a "*" entry does. Either is
+    refused by q=0 (e.g. "gzip;q=0").
+    """
+    qualities = {}
+    for entry in accept_encoding.split(','):
+        coding, *params = entry.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def _dumps(data):
+    """Serialize a response body to UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder handles them
+            pass
+    return json.dumps(data).encode('utf-8')
+
+
+# Seeded results keyed by _fingerprint(), least recently used first
+_SEEDED_CACHE = OrderedDict()
+_SEEDED_CACHE_SIZE = 1024
+_SEEDED_CACHE_LOCK = threading.Lock()
+# Longer texts are humanized but not cached, so a full cache stays small
+_SEEDED_CACHE_MAX_CHARS = 10000
+
+
+def _fingerprint(text, *params):
+    """
+    16-byte cache key for a request.
+
+    humanize_text strips its input, so the key uses the stripped text:
+    whitespace-padded retries share an entry, and long texts are not kept
+    alive as dictionary keys.
+    """
+    digest = hashlib.blake2b(repr(params).encode('utf-8'), digest_size=16)
+    digest.update(b'\0')
+    digest.update(text.strip().encode('utf-8', 'surrogatepass'))
+    return digest.digest()
+
+
+def humanize_request(text, p_synonym, p_transition, p_rhythm, seed=None):
+    """
+    Humanize one text for an API request.
+
+    Seeded output is deterministic, so seeded requests are answered from
+    an LRU cache. Unseeded requests are meant to vary between calls, so
+    they always run the humanizer.
+    """
+    cacheable = (seed is not None and isinstance(text, str) and
+                 len(text) <= _SEEDED_CACHE_MAX_CHARS)
+    if cacheable:
+        key = _fingerprint(text, p_synonym, p_transition, p_rhythm, seed)
+        with _SEEDED_CACHE_LOCK:
+            if key in _SEEDED_CACHE:
+                _SEEDED_CACHE.move_to_end(key)
+                return _SEEDED_CACHE[key]
+
+    result = HUMANIZER.humanize_text(
+        text,
+        p_synonym=p_synonym,
+        p_transition=p_transition,
+        p_rhythm=p_rhythm,
+        seed=seed
+    )
+
+    if cacheable:
+        with _SEEDED_CACHE_LOCK:
+            _SEEDED_CACHE[key] = result
+            if len(_SEEDED_CACHE) > _SEEDED_CACHE_SIZE:
+                _SEEDED_CACHE.popitem(last=False)
+    return result
+
+
+# Static GET response, built once at import
+API_INFO = {
+    'message': 'Academic Text Humanizer API',
+    'usage': 'Send POST request with JSON body: {"text": "your text here"}',
+    'batch_usage': 'Or send {"texts": ["first text", "second text"]} '
+                   'to humanize several texts in one request',
+    'streaming_usage': 'POST to /?stream=1 with {"text": ...} to receive '
+                       'plain text, sentence by sentence, as it is produced',
+    'optional_params': {
+        'p_synonym': 'Probability of synonym replacement (0-1, default: 0.4)',
+        'p_transition': 'Probability of adding transitions (0-1, default: 0.3)',
+        'p_rhythm': 'Probability of rhythm variation (0-1, default: 0.5)',
+        'seed': 'Random seed for reproducibility (integer, optional)'
+    }
+}
+# Encoded and compressed once; do_GET only writes these bytes
+_API_INFO_BODY = _dumps(API_INFO)
+_API_INFO_GZIP = gzip.compress(_API_INFO_BODY, compresslevel=6)
+
+
 class handler(BaseHTTPRequestHandler):
     """Vercel serverless function handler."""
     
-    def _set_headers(self, status_code=200):
+    def _set_headers(self, status_code=200, extra_headers=None,
+                     content_type='application/json'):
         """Set common response headers."""
         self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-type', content_type)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
     
-    def _send_json_response(self, data, status_code=200):
-        """Send JSON response."""
-        self._set_headers(status_code)
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+    def _send_json_response(self, data, status_code=200, extra_headers=None):
+        """Send JSON response, gzip-compressed when the client accepts it."""
+        self._send_body(_dumps(data), status_code, extra_headers)
+    
+    def _send_body(self, body, status_code=200, extra_headers=None, compressed=None):
+        """
+        Send encoded JSON bytes. `compressed` is an optional pre-built gzip
+        of `body`, used instead of compressing it again.
+        """
+        headers = {'Vary': 'Accept-Encoding'}
+        headers.update(extra_headers or {})
+        
+        if (len(body) >= GZIP_MIN_BYTES and
+                _accepts_gzip(self.headers.get('Accept-Encoding', ''))):
+            if compressed is None:
+                compressed = gzip.compress(body, compresslevel=6)
+            body = compressed
+            headers['Content-Encoding'] = 'gzip'
+        
+        self._set_headers(status_code, headers)
+        self.wfile.write(body)
+    
+    def _stream_text(self, text, p_synonym, p_transition, p_rhythm, seed):
+        """
+        Send the humanized text as plain text, one sentence per write.
+
+        There is no Content-Length; the response ends when the connection
+        closes, so clients see the first sentences while later ones are
+        still being processed.
+        """
+        if isinstance(text, str):
+            sentences = HUMANIZER.iter_humanized(
+                text, p_synonym, p_transition, p_rhythm, seed
+            )
+        else:
+            # Same answer humanize_text gives for non-string input
+            sentences = ["Invalid input"]
+        
+        self.close_connection = True
+        self._set_headers(200, {'Cache-Control': 'no-store'},
+                          content_type='text/plain; charset=utf-8')
+        # The status line is already out, so do_POST's error responses
+        # cannot be sent from here on. Log the error instead; closing the
+        # connection ends the truncated body.
+        sep = b''
+        try:
+            for sentence in sentences:
+                self.wfile.write(sep + sentence.encode('utf-8', 'surrogatepass'))
+                sep = b' '
+        except Exception as e:
+            self.log_error('Streaming stopped: %r', e)
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
@@ -133,23 +368,27 @@ class handler(BaseHTTPRequestHandler):
     
     def do_GET(self):
         """Handle GET requests - return API info."""
-        response = {
-            'message': 'Academic Text Humanizer API',
-            'usage': 'Send POST request with JSON body: {"text": "your text here"}',
-            'optional_params': {
-                'p_synonym': 'Probability of synonym replacement (0-1, default: 0.4)',
-                'p_transition': 'Probability of adding transitions (0-1, default: 0.3)',
-                'p_rhythm': 'Probability of rhythm variation (0-1, default: 0.5)',
-                'seed': 'Random seed for reproducibility (integer, optional)'
-            }
-        }
-        self._send_json_response(response)
+        self._send_body(_API_INFO_BODY, extra_headers={
+            'Cache-Control': 'public, max-age=3600'
+        }, compressed=_API_INFO_GZIP)
     
     def do_POST(self):
         """Handle POST requests - process text humanization."""
         try:
             # Read and parse request body
-            content_length = int(self.headers.get('Content-Length', 0))
+            try:
+                content_length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                content_length = -1
+            
+            # rfile.read(-1) would read to EOF with no size limit
+            if content_length < 0:
+                self.close_connection = True
+                self._send_json_response({
+                    'error': 'Invalid Content-Length',
+                    'message': 'Content-Length must be a non-negative integer'
+                }, 400)
+                return
             
             if content_length == 0:
                 self._send_json_response({
@@ -158,19 +397,46 @@ class handler(BaseHTTPRequestHandler):
                 }, 400)
                 return
             
+            # Refuse oversized bodies without reading them into memory
+            if content_length > MAX_BODY_BYTES:
+                self.close_connection = True
+                self._send_json_response({
+                    'error': 'Payload too large',
+                    'message': f'Request body must be at most {MAX_BODY_BYTES} bytes'
+                }, 413)
+                return
+            
             post_data = self.rfile.read(content_length)
             data = json.loads(post_data.decode('utf-8'))
             
-            # Extract parameters
+            if not isinstance(data, dict):
+                self._send_json_response({
+                    'error': 'Invalid JSON',
+                    'message': 'Request body must be a JSON object'
+                }, 400)
+                return
+            
+            # Extract parameters: a single "text" or a batch of "texts"
             text = data.get('text', '')
+            texts = data.get('texts')
             
-            if not text:
+            if texts is not None:
+                if (not isinstance(texts, list) or not texts or
+                        not all(isinstance(t, str) and t for t in texts)):
+                    self._send_json_response({
+                        'error': 'Invalid texts parameter',
+                        'message': '"texts" must be a non-empty list of non-empty strings'
+                    }, 400)
+                    return
+            elif not text:
                 self._send_json_response({
                     'error': 'Missing text parameter',
                     'message': 'Please provide "text" field in JSON body'
                 }, 400)
                 return
             
+            inputs = texts if texts is not None else [text]
+            
             # Optional parameters
             p_synonym = float(data.get('p_synonym', 0.4))
             p_transition = float(data.get('p_transition', 0.3))
@@ -185,22 +451,31 @@ class handler(BaseHTTPRequestHandler):
                 }, 400)
                 return
             
-            # Initialize humanizer with parameters
-            humanizer = MicroAcademicHumanizer(
-                p_synonym=p_synonym,
-                p_transition=p_transition,
-                p_rhythm=p_rhythm,
-                seed=seed
-            )
+            # ?stream=1 sends a single text back as plain text while it is
+            # being humanized
+            query = parse_qs(urlsplit(self.path).query)
+            if query.get('stream', [''])[0] in ('1', 'true'):
+                if texts is not None:
+                    self._send_json_response({
+                        'error': 'Streaming not supported for batches',
+                        'message': 'Use "text" instead of "texts" with stream=1'
+                    }, 400)
+                    return
+                self._stream_text(text, p_synonym, p_transition, p_rhythm, seed)
+                return
             
-            # Process text
-            result = humanizer.humanize_text(text)
+            # Process text with the shared humanizer; a batch runs every
+            # entry through it within this one request
+            results = [
+                humanize_request(t, p_synonym, p_transition, p_rhythm, seed)
+                for t in inputs
+            ]
             
             # Send successful response
             self._send_json_response({
                 'success': True,
-                'original': text,
-                'humanized': result,
+                'original': texts if texts is not None else text,
+                'humanized': results if texts is not None else results[0],
                 'parameters': {
                     'p_synonym': p_synonym,
                     'p_transition': p_transition,
@@ -226,3 +501,20 @@ class handler(BaseHTTPRequestHandler):
                 'error': 'Internal server error',
                 'message': str(e)
             }, 500)
+
+
+class _LocalServer(ThreadingHTTPServer):
+    """Threaded server for running the handler outside Vercel."""
+    # socketserver's default listen backlog of 5 refuses connections
+    # during bursts; let them queue instead
+    request_queue_size = 64
+
+
+if __name__ == "__main__":
+    # Local development server. Each request gets its own thread, so one slow
+    # humanization does not hold up other clients behind it.
+    host = os.environ.get("HOST", "0.0.0.0")
+    port = int(os.environ.get("PORT", 8000))
+    server = _LocalServer((host, port), handler)
+    print(f"Serving on http://{host}:{port}")
+    server.serve_forever()